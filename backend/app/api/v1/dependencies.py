@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from fastapi import Depends, HTTPException
+
+from app.services.expense_parser import ExpenseParserService
+from app.services.llm import LLMClient, get_llm_client
+from app.services.trip_repository import TripRepository, get_trip_repository
+
+
+def require_storage_enabled(repository: TripRepository = Depends(get_trip_repository)) -> None:
+    """Reject requests to storage-backed routes when Supabase is not configured.
+
+    FastAPI caches ``get_trip_repository`` per request, so endpoints that also depend on it
+    receive the same instance.
+    """
+
+    if not repository.enabled:
+        raise HTTPException(status_code=503, detail="Trip storage not configured")
+
+
+def get_expense_parser_service(
+    llm_client: LLMClient = Depends(get_llm_client),
+) -> ExpenseParserService:
+    # Lives outside expense_parser so FastAPI can inspect its signature when that module is
+    # compiled with mypyc.
+    return ExpenseParserService(llm_client=llm_client)
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Any, TypeVar
 
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+from app.api.v1.dependencies import get_expense_parser_service
+from app.core.responses import PydanticJSONResponse
 from app.schemas.expense import (
     ExpenseCreate,
     ExpenseParseRequest,
@@ -9,10 +15,37 @@ from app.schemas.expense import (
     ExpenseResponse,
     ExpenseUpdate,
 )
-from app.services.expense_parser import ExpenseParserService, get_expense_parser_service
+from app.services.expense_parser import ExpenseParserService
 from app.services.trip_repository import TripRepository, get_trip_repository
 
 router = APIRouter()
+# Routes that work without trip storage; mounted without the storage dependency.
+parse_router = APIRouter()
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _json_body(model: type[BaseModel]) -> dict[str, Any]:
+    # Documents the request body for endpoints that decode it themselves.
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+
+async def _decode_body(request: Request, model: type[ModelT]) -> ModelT:
+    # Validate the raw bytes in pydantic-core in one pass instead of letting FastAPI parse
+    # the JSON into a dict and then validate that dict.
+    body = await request.body()
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as exc:
+        errors = [
+            {**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)
+        ]
+        raise RequestValidationError(errors, body=body) from None
 
 
 @router.get("", response_model=list[ExpenseResponse])
@@ -20,22 +53,25 @@ async def list_expenses(
     trip_id: str = Query(..., alias="tripId"),
     user_id: str = Query(..., alias="userId"),
     repository: TripRepository = Depends(get_trip_repository),
-) -> list[ExpenseResponse]:
-    if not repository.enabled:
-        raise HTTPException(status_code=503, detail="Trip storage not configured")
-
-    return await repository.list_expenses(trip_id=trip_id, user_id=user_id)
+) -> Response:
+    expenses = await repository.list_expenses(trip_id=trip_id, user_id=user_id)
+    # Returning the response directly skips FastAPI's second validation of the
+    # already-validated rows against ``response_model``.
+    return PydanticJSONResponse(expenses)
 
 
-@router.post("", response_model=ExpenseResponse, status_code=201)
+@router.post(
+    "",
+    response_model=ExpenseResponse,
+    status_code=201,
+    openapi_extra=_json_body(ExpenseCreate),
+)
 async def create_expense(
-    payload: ExpenseCreate,
+    request: Request,
     user_id: str = Query(..., alias="userId"),
     repository: TripRepository = Depends(get_trip_repository),
-) -> ExpenseResponse:
-    if not repository.enabled:
-        raise HTTPException(status_code=503, detail="Trip storage not configured")
-
+) -> Response:
+    payload = await _decode_body(request, ExpenseCreate)
     expense = await repository.add_expense(
         trip_id=payload.trip_id,
         user_id=user_id,
@@ -48,27 +84,29 @@ async def create_expense(
     if not expense:
         raise HTTPException(status_code=404, detail="Trip not found")
 
-    return expense
+    return PydanticJSONResponse(expense, status_code=201)
 
 
-@router.post("/parse", response_model=ExpenseParseResponse)
+@parse_router.post("/parse", response_model=ExpenseParseResponse)
 async def parse_expense_text(
     payload: ExpenseParseRequest,
     service: ExpenseParserService = Depends(get_expense_parser_service),
-) -> ExpenseParseResponse:
-    return await service.parse(payload)
+) -> Response:
+    return PydanticJSONResponse(await service.parse(payload))
 
 
-@router.patch("/{expense_id}", response_model=ExpenseResponse)
+@router.patch(
+    "/{expense_id}",
+    response_model=ExpenseResponse,
+    openapi_extra=_json_body(ExpenseUpdate),
+)
 async def update_expense(
     expense_id: str,
-    payload: ExpenseUpdate,
+    request: Request,
     user_id: str = Query(..., alias="userId"),
     repository: TripRepository = Depends(get_trip_repository),
-) -> ExpenseResponse:
-    if not repository.enabled:
-        raise HTTPException(status_code=503, detail="Trip storage not configured")
-
+) -> Response:
+    payload = await _decode_body(request, ExpenseUpdate)
     updates = payload.model_dump(exclude_unset=True)
     if "occurred_on" in updates and updates["occurred_on"] is not None:
         updates["occurred_on"] = updates["occurred_on"].isoformat()
@@ -82,7 +120,7 @@ async def update_expense(
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
 
-    return expense
+    return PydanticJSONResponse(expense)
 
 
 @router.delete("/{expense_id}", status_code=204)
@@ -91,9 +129,6 @@ async def delete_expense(
     user_id: str = Query(..., alias="userId"),
     repository: TripRepository = Depends(get_trip_repository),
 ) -> Response:
-    if not repository.enabled:
-        raise HTTPException(status_code=503, detail="Trip storage not configured")
-
     deleted = await repository.delete_expense(expense_id=expense_id, user_id=user_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Expense not found")
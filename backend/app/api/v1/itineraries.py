@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
+from app.core.responses import PydanticJSONResponse
 from app.schemas.itinerary import ItineraryRequest, ItineraryResponse
 from app.services.itinerary import ItineraryService, get_itinerary_service
 
@@ -10,7 +11,7 @@ router = APIRouter()
 async def create_itinerary(
     payload: ItineraryRequest,
     service: ItineraryService = Depends(get_itinerary_service),
-) -> ItineraryResponse:
+) -> Response:
     """Generate an itinerary and budget estimate from user intent."""
 
-    return await service.generate_itinerary(payload)
+    return PydanticJSONResponse(await service.generate_itinerary(payload))
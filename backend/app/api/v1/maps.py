@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
+from app.core.responses import PydanticJSONResponse
 from app.schemas.map import TripMapResponse
 from app.services.trip_map import TripMapService, get_trip_map_service
 
@@ -13,11 +14,13 @@ async def get_trip_map(
     trip_id: str,
     user_id: str = Query(..., alias="userId"),
     service: TripMapService = Depends(get_trip_map_service),
-) -> TripMapResponse:
+) -> Response:
     if not user_id:
         raise HTTPException(status_code=400, detail="userId is required")
 
     if not service.maps_enabled:
         raise HTTPException(status_code=503, detail="Baidu map service is not configured")
 
-    return await service.build_trip_map(user_id=user_id, trip_id=trip_id)
+    trip_map = await service.build_trip_map(user_id=user_id, trip_id=trip_id)
+    # Built from validated models; skip FastAPI's re-validation against ``response_model``.
+    return PydanticJSONResponse(trip_map)
@@ -1,10 +1,19 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.api.v1 import expenses, itineraries, maps, trips
+from app.api.v1.dependencies import require_storage_enabled
+from app.core.responses import PydanticJSONResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=PydanticJSONResponse)
+
+storage_dependencies = [Depends(require_storage_enabled)]
 
 router.include_router(itineraries.router, prefix="/itineraries", tags=["itineraries"])
-router.include_router(trips.router, prefix="/trips", tags=["trips"])
-router.include_router(expenses.router, prefix="/expenses", tags=["expenses"])
+router.include_router(
+    trips.router, prefix="/trips", tags=["trips"], dependencies=storage_dependencies
+)
+router.include_router(expenses.parse_router, prefix="/expenses", tags=["expenses"])
+router.include_router(
+    expenses.router, prefix="/expenses", tags=["expenses"], dependencies=storage_dependencies
+)
 router.include_router(maps.router, prefix="/maps", tags=["maps"])
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
-
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+
+from app.core.responses import (
+    PydanticJSONResponse,
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
 from app.schemas.trip import TripDetailResponse, TripResponse
 from app.services.trip_repository import TripRepository, get_trip_repository
 
@@ -13,24 +20,28 @@ async def list_trips(
     user_id: str = Query(..., alias="userId"),
     limit: int = Query(default=20, ge=1, le=100),
     repository: TripRepository = Depends(get_trip_repository),
-) -> list[TripResponse]:
-    if not repository.enabled:
-        raise HTTPException(status_code=503, detail="Trip storage not configured")
-
-    return await repository.fetch_trips(user_id=user_id, limit=limit)
+) -> Response:
+    trips = await repository.fetch_trips(user_id=user_id, limit=limit)
+    # Returning the response directly skips FastAPI's second validation of the
+    # already-validated rows against ``response_model``.
+    return PydanticJSONResponse(trips)
 
 
 @router.get("/{trip_id}", response_model=TripDetailResponse)
 async def get_trip_detail(
+    request: Request,
     trip_id: str = Path(..., description="Trip identifier"),
     user_id: str = Query(..., alias="userId"),
     repository: TripRepository = Depends(get_trip_repository),
-) -> TripDetailResponse:
-    if not repository.enabled:
-        raise HTTPException(status_code=503, detail="Trip storage not configured")
-
+) -> Response:
     trip = await repository.fetch_trip_detail(user_id=user_id, trip_id=trip_id)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
 
-    return trip
+    # Expense writes do not touch the trip row, so the ETag is taken from the rendered body
+    # rather than ``updated_at``; a match still saves the transfer and client-side parse.
+    response = PydanticJSONResponse(trip)
+    etag = make_etag(response.body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return set_cache_headers(response, etag)
@@ -1,12 +1,25 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.routes import router as api_router
+from app.services import baidu_maps, supabase_client, trip_cache
 
 load_dotenv()
 
-app = FastAPI(title="AI Travel Planner API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    await baidu_maps.close_http_client()
+    await supabase_client.close_supabase_client()
+    await trip_cache.close_redis()
+
+
+app = FastAPI(title="AI Travel Planner API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,7 +16,8 @@ class ExpenseCreate(BaseModel):
 
 
 class ExpenseResponse(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    # Built from snake_case database rows only; aliases are used for serialization.
+    model_config = ConfigDict(validate_by_name=True, validate_by_alias=False)
 
     id: str
     trip_id: str = Field(..., alias="tripId")
@@ -46,7 +47,7 @@ class ExpenseParseRequest(BaseModel):
 
 
 class ExpenseParseResponse(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(validate_by_name=True, validate_by_alias=False)
 
     category: str | None = None
     amount: float | None = None
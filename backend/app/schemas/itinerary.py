@@ -15,6 +15,8 @@ class Budget(BaseModel):
 
 
 class ItineraryResponse(BaseModel):
+    model_config = ConfigDict(validate_by_name=True, validate_by_alias=False)
+
     itinerary: str = Field(..., description="Generated itinerary in markdown format")
     budget: Budget
     trip_id: str | None = Field(default=None, alias="tripId")
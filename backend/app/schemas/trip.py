@@ -3,14 +3,12 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, Field
 
 from app.schemas.expense import ExpenseResponse
 
 
 class TripResponse(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
-
     id: str
     title: str
     intent: str
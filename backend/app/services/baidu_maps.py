@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, AsyncGenerator
+from collections import OrderedDict
+from typing import Any
 
 import httpx
-from fastapi import Depends
 
 from app.core.config import get_settings
 
@@ -12,23 +12,57 @@ logger = logging.getLogger(__name__)
 
 BAIDU_GEOCODE_ENDPOINT = "https://api.map.baidu.com/geocoding/v3/"
 
+# Shared across requests so keep-alive connections to api.map.baidu.com survive between
+# geocode calls; closed from the application lifespan.
+_http_client: httpx.AsyncClient | None = None
+
+# Successful geocodes keyed by (address, city); coordinates of a named place do not move,
+# so repeat lookups across trips are served from memory. Failures are not cached.
+GEOCODE_CACHE_SIZE = 1024
+_geocode_cache: OrderedDict[tuple[str, str | None], dict[str, Any]] = OrderedDict()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class BaiduMapsClient:
-    def __init__(self, *, api_key: str | None) -> None:
+    def __init__(self, *, api_key: str | None, client: httpx.AsyncClient | None = None) -> None:
         self._api_key = api_key
-        self._client = httpx.AsyncClient(timeout=10.0)
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=10.0)
 
     @property
     def enabled(self) -> bool:
         return bool(self._api_key)
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
     async def geocode(self, *, address: str, city: str | None = None) -> dict[str, Any] | None:
         if not self.enabled:
             return None
 
+        cache_key = (address, city)
+        cached = _geocode_cache.get(cache_key)
+        if cached is not None:
+            _geocode_cache.move_to_end(cache_key)
+            return cached
+
         params = {
             "address": address,
             "output": "json",
@@ -63,7 +97,7 @@ class BaiduMapsClient:
         if lat is None or lng is None:
             return None
 
-        return {
+        parsed = {
             "lat": float(lat),
             "lng": float(lng),
             "precise": result.get("precise"),
@@ -72,11 +106,12 @@ class BaiduMapsClient:
             "address": result.get("formatted_address") or result.get("name"),
         }
 
+        _geocode_cache[cache_key] = parsed
+        if len(_geocode_cache) > GEOCODE_CACHE_SIZE:
+            _geocode_cache.popitem(last=False)
+        return parsed
+
 
-async def get_baidu_maps_client() -> AsyncGenerator[BaiduMapsClient, None]:
+def get_baidu_maps_client() -> BaiduMapsClient:
     settings = get_settings()
-    client = BaiduMapsClient(api_key=settings.baidu_map_ak)
-    try:
-        yield client
-    finally:
-        await client.close()
+    return BaiduMapsClient(api_key=settings.baidu_map_ak, client=get_http_client())
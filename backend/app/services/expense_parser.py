@@ -2,20 +2,17 @@ from __future__ import annotations
 
 import logging
 import re
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from typing import Any, Mapping
-
-from fastapi import Depends
+from typing import Any, Iterable, Mapping
 
 from app.schemas.expense import ExpenseParseRequest, ExpenseParseResponse
-from app.services.llm import LLMClient, get_llm_client
-from app.services.prompt import build_expense_parse_prompt
+from app.services.llm import LLMClient
+from app.services.prompt import EXPENSE_PARSE_PROMPT, build_expense_parse_prompt
 
 logger = logging.getLogger(__name__)
 
-AMOUNT_PATTERN = re.compile(r"-?\d+(?:[\.,]\d+)?")
 DATE_PATTERN = re.compile(r"(\d{4})[./-](\d{1,2})[./-](\d{1,2})")
-ISO_CURRENCY_PATTERN = re.compile(r"\b([A-Z]{3})\b")
 CHINESE_NUMERAL_PATTERN = re.compile(r"[零〇一二两三四五六七八九十拾百佰千仟万萬亿億点\.]+")
 
 CATEGORY_KEYWORDS: Mapping[str, tuple[str, ...]] = {
@@ -35,6 +32,17 @@ CURRENCY_SYMBOLS: Mapping[str, str] = {
     "HK$": "HKD",
 }
 
+# Single-character symbols keyed by codepoint for constant-time dispatch on short currency
+# strings (e.g. an LLM answering "¥" instead of an ISO code).
+CURRENCY_SYMBOL_CODEPOINTS: Mapping[int, str] = {
+    ord(symbol): code for symbol, code in CURRENCY_SYMBOLS.items() if len(symbol) == 1
+}
+# Multi-character symbols are probed as substrings before the codepoint dispatch so "HK$"
+# is not read as "$".
+MULTI_CHAR_CURRENCY_SYMBOLS: tuple[tuple[str, str], ...] = tuple(
+    (symbol, code) for symbol, code in CURRENCY_SYMBOLS.items() if len(symbol) > 1
+)
+
 CURRENCY_KEYWORDS: Mapping[str, str] = {
     "人民币": "CNY",
     "元": "CNY",
@@ -62,6 +70,19 @@ CURRENCY_KEYWORDS: Mapping[str, str] = {
     "aud": "AUD",
 }
 
+
+def _index_by_first_char(keywords: Mapping[str, str]) -> dict[str, tuple[tuple[str, str], ...]]:
+    index: dict[str, list[tuple[str, str]]] = {}
+    for keyword in sorted(keywords, key=len, reverse=True):
+        lowered = keyword.lower()
+        index.setdefault(lowered[0], []).append((lowered, keywords[keyword]))
+    return {char: tuple(entries) for char, entries in index.items()}
+
+
+CURRENCY_KEYWORDS_BY_FIRST_CHAR: Mapping[str, tuple[tuple[str, str], ...]] = _index_by_first_char(
+    CURRENCY_KEYWORDS
+)
+
 RELATIVE_DATE_KEYWORDS: Mapping[str, int] = {
     "今天": 0,
     "今日": 0,
@@ -72,6 +93,39 @@ RELATIVE_DATE_KEYWORDS: Mapping[str, int] = {
     "后天": 2,
 }
 
+
+def _alternation(words: Iterable[str]) -> str:
+    # Longest first so that e.g. "HK$" wins over "$" and "美元" over "元".
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+# Currency and category keywords share one dictionary so a single alternation finds both;
+# each hit carries its kind and value, like the payload of a keyword automaton.
+KEYWORD_LOOKUP: Mapping[str, tuple[str, str]] = {
+    **{
+        keyword: ("category", category)
+        for category, keywords in CATEGORY_KEYWORDS.items()
+        for keyword in keywords
+    },
+    **{keyword: ("currency", code) for keyword, code in CURRENCY_KEYWORDS.items()},
+}
+
+CATEGORY_PRIORITY: Mapping[str, int] = {
+    category: index for index, category in enumerate(CATEGORY_KEYWORDS)
+}
+
+# Single pass over the content: each hit is classified through ``lastgroup`` instead of
+# re-scanning the text once per symbol, keyword and pattern.
+SCAN_PATTERN = re.compile(
+    rf"(?P<symbol>{_alternation(CURRENCY_SYMBOLS)})"
+    rf"|(?P<keyword>{_alternation(KEYWORD_LOOKUP)})"
+    rf"|(?P<relative>{_alternation(RELATIVE_DATE_KEYWORDS)})"
+    r"|(?P<iso>\b[A-Za-z]{3}\b)"
+    r"|(?P<date>(?P<year>\d{4})[./-](?P<month>\d{1,2})[./-](?P<day>\d{1,2}))"
+    r"|(?P<amount>-?\d+(?:,\d+)*(?:\.\d+)?)",
+    re.IGNORECASE,
+)
+
 CHINESE_DIGITS = {
     "零": 0,
     "〇": 0,
@@ -100,6 +154,24 @@ CHINESE_UNITS = {
     "億": 100_000_000,
 }
 
+# Digits and units folded into one table so the integer parser does a single lookup per
+# character; the flag marks unit characters.
+CHINESE_NUMERALS: Mapping[str, tuple[int, bool]] = {
+    **{char: (value, False) for char, value in CHINESE_DIGITS.items()},
+    **{char: (value, True) for char, value in CHINESE_UNITS.items()},
+}
+
+
+@dataclass(slots=True)
+class _ScanResult:
+    amount: float | None = None
+    occurred_on: date | None = None
+    relative_offset: int | None = None
+    symbol_currency: str | None = None
+    keyword_currency: str | None = None
+    iso_currency: str | None = None
+    category: str | None = None
+
 
 class ExpenseParserService:
     def __init__(self, llm_client: LLMClient | None) -> None:
@@ -114,7 +186,7 @@ class ExpenseParserService:
                 date_hint=payload.date_hint,
             )
             try:
-                llm_result = await self._llm_client.complete(prompt)
+                llm_result = await self._llm_client.complete(prompt, system=EXPENSE_PARSE_PROMPT)
             except Exception as exc:  # pragma: no cover - defensive logging
                 logger.warning("LLM expense parsing failed: %s", exc)
                 llm_result = {}
@@ -135,10 +207,11 @@ class ExpenseParserService:
         llm_confidence = _to_float(llm_result.get("confidence"))
         llm_notes = _get_str(llm_result.get("notes"))
 
-        amount = llm_amount if llm_amount is not None else _extract_amount(content)
-        currency = _resolve_currency(content, llm_currency, payload.currency_hint)
-        occurred_on = llm_date or _extract_date(content, payload.date_hint)
-        category = _resolve_category(content, llm_category)
+        scan = _scan(content)
+        amount = llm_amount if llm_amount is not None else _extract_amount(content, scan)
+        currency = _resolve_currency(scan, llm_currency, payload.currency_hint)
+        occurred_on = llm_date or _extract_date(scan, payload.date_hint)
+        category = _resolve_category(scan, llm_category)
         notes = llm_notes or content
 
         confidence = _derive_confidence(
@@ -185,25 +258,76 @@ def _to_date(value: Any) -> date | None:
         text = value.strip()
         if not text:
             return None
-        try:
-            return date.fromisoformat(text[:10])
-        except ValueError:
-            match = DATE_PATTERN.search(text)
-            if match:
-                year, month, day = (int(part) for part in match.groups())
-                return _safe_date(year, month, day)
+        parsed = _fast_iso_date(text)
+        if parsed:
+            return parsed
+        match = DATE_PATTERN.search(text)
+        if match:
+            year, month, day = (int(part) for part in match.groups())
+            return _safe_date(year, month, day)
     return None
 
 
-def _extract_amount(text: str) -> float | None:
-    normalized_text = text.replace(",", "")
-    match = AMOUNT_PATTERN.search(normalized_text)
-    if match:
-        candidate = match.group().replace(",", "").replace(" ", "")
-        try:
-            return float(candidate)
-        except ValueError:
-            pass
+def _fast_iso_date(text: str) -> date | None:
+    # Shape check before any int() conversion, so non-date LLM output never raises.
+    head = text[:10]
+    if (
+        len(head) == 10
+        and head.isascii()
+        and head[4] in "-/."
+        and head[7] in "-/."
+        and head[:4].isdigit()
+        and head[5:7].isdigit()
+        and head[8:10].isdigit()
+    ):
+        return _safe_date(int(head[:4]), int(head[5:7]), int(head[8:10]))
+    if len(text) == 8 and text.isascii() and text.isdigit():
+        # Compact ISO form (YYYYMMDD), also accepted by date.fromisoformat.
+        return _safe_date(int(text[:4]), int(text[4:6]), int(text[6:8]))
+    return None
+
+
+def _scan(text: str) -> _ScanResult:
+    result = _ScanResult()
+    for match in SCAN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "amount":
+            if result.amount is None:
+                try:
+                    result.amount = float(value.replace(",", ""))
+                except ValueError:
+                    pass
+        elif kind == "date":
+            if result.occurred_on is None:
+                result.occurred_on = _safe_date(
+                    int(match.group("year")), int(match.group("month")), int(match.group("day"))
+                )
+        elif kind == "symbol":
+            if result.symbol_currency is None:
+                result.symbol_currency = CURRENCY_SYMBOLS[value.upper()]
+        elif kind == "keyword":
+            keyword_kind, keyword_value = KEYWORD_LOOKUP[value.lower()]
+            if keyword_kind == "currency":
+                if result.keyword_currency is None:
+                    result.keyword_currency = keyword_value
+            elif (
+                result.category is None
+                or CATEGORY_PRIORITY[keyword_value] < CATEGORY_PRIORITY[result.category]
+            ):
+                result.category = keyword_value
+        elif kind == "relative":
+            if result.relative_offset is None:
+                result.relative_offset = RELATIVE_DATE_KEYWORDS[value]
+        elif kind == "iso":
+            if result.iso_currency is None:
+                result.iso_currency = value.upper()
+    return result
+
+
+def _extract_amount(text: str, scan: _ScanResult) -> float | None:
+    if scan.amount is not None:
+        return scan.amount
 
     chinese_matches = CHINESE_NUMERAL_PATTERN.findall(text)
     for chinese in chinese_matches:
@@ -264,27 +388,29 @@ def _parse_chinese_integer(text: str) -> int | None:
     number = 0
     has_value = False
 
+    lookup = CHINESE_NUMERALS.get
     for char in text:
-        digit = CHINESE_DIGITS.get(char)
-        if digit is not None:
-            number = digit
-            has_value = True
+        entry = lookup(char)
+        if entry is None:
             continue
 
-        unit = CHINESE_UNITS.get(char)
-        if unit is not None:
-            has_value = True
-            if number == 0 and unit <= 10:
-                number = 1
+        value, is_unit = entry
+        has_value = True
+        if not is_unit:
+            number = value
+            continue
+
+        if number == 0 and value <= 10:
+            number = 1
 
-            if unit < 10_000:
-                section += number * unit
-            else:
-                section = (section + number) * unit
-                total += section
-                section = 0
+        if value < 10_000:
+            section += number * value
+        else:
+            section = (section + number) * value
+            total += section
+            section = 0
 
-            number = 0
+        number = 0
 
     result = total + section + number
     return result if has_value else None
@@ -302,38 +428,39 @@ def _normalize_currency_code(value: str | None) -> str | None:
         return CURRENCY_KEYWORDS[lowered]
 
     upper = candidate.upper()
-    if upper in CURRENCY_KEYWORDS:
-        return CURRENCY_KEYWORDS[upper]
-
     if len(upper) == 3 and upper.isalpha():
         return upper
 
-    for keyword, code in CURRENCY_KEYWORDS.items():
-        if keyword in candidate:
-            return code
+    if upper in CURRENCY_SYMBOLS:
+        return CURRENCY_SYMBOLS[upper]
 
-    return None
+    for symbol, symbol_code in MULTI_CHAR_CURRENCY_SYMBOLS:
+        if symbol in upper:
+            return symbol_code
 
+    for char in candidate:
+        code = CURRENCY_SYMBOL_CODEPOINTS.get(ord(char))
+        if code:
+            return code
 
-def _resolve_currency(text: str, llm_currency: str | None, hint: str | None) -> str | None:
-    candidates: list[str | None] = [llm_currency]
-
-    text_lower = text.lower()
-    text_upper = text.upper()
-
-    for symbol, code in CURRENCY_SYMBOLS.items():
-        if symbol in text:
-            candidates.append(code)
+    # Leftmost-longest keyword hit; only keywords starting with the current character are
+    # probed, so most positions cost a single dict miss.
+    for index, char in enumerate(lowered):
+        for keyword, code in CURRENCY_KEYWORDS_BY_FIRST_CHAR.get(char, ()):
+            if lowered.startswith(keyword, index):
+                return code
 
-    for keyword, code in CURRENCY_KEYWORDS.items():
-        if keyword and keyword in text_lower:
-            candidates.append(code)
+    return None
 
-    iso_match = ISO_CURRENCY_PATTERN.search(text_upper)
-    if iso_match:
-        candidates.append(iso_match.group(1))
 
-    candidates.append(hint)
+def _resolve_currency(scan: _ScanResult, llm_currency: str | None, hint: str | None) -> str | None:
+    candidates = (
+        llm_currency,
+        scan.symbol_currency,
+        scan.keyword_currency,
+        scan.iso_currency,
+        hint,
+    )
 
     for candidate in candidates:
         normalized = _normalize_currency_code(candidate)
@@ -343,30 +470,21 @@ def _resolve_currency(text: str, llm_currency: str | None, hint: str | None) ->
     return None
 
 
-def _extract_date(text: str, hint: date | None) -> date | None:
-    match = DATE_PATTERN.search(text)
-    if match:
-        year, month, day = (int(part) for part in match.groups())
-        parsed = _safe_date(year, month, day)
-        if parsed:
-            return parsed
+def _extract_date(scan: _ScanResult, hint: date | None) -> date | None:
+    if scan.occurred_on:
+        return scan.occurred_on
 
-    for keyword, offset in RELATIVE_DATE_KEYWORDS.items():
-        if keyword in text:
-            return date.today() + timedelta(days=offset)
+    if scan.relative_offset is not None:
+        return date.today() + timedelta(days=scan.relative_offset)
 
     return hint
 
 
-def _resolve_category(text: str, llm_category: str | None) -> str | None:
+def _resolve_category(scan: _ScanResult, llm_category: str | None) -> str | None:
     if llm_category:
         return llm_category.strip()
 
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        if any(keyword in text for keyword in keywords):
-            return category
-
-    return None
+    return scan.category
 
 
 def _derive_confidence(*, llm_confidence: float | None, used_llm: bool, has_amount: bool, has_category: bool) -> float | None:
@@ -387,9 +505,3 @@ def _safe_date(year: int, month: int, day: int) -> date | None:
         return date(year, month, day)
     except ValueError:
         return None
-
-
-def get_expense_parser_service(
-    llm_client: LLMClient = Depends(get_llm_client),
-) -> ExpenseParserService:
-    return ExpenseParserService(llm_client=llm_client)
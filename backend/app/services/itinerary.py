@@ -1,17 +1,29 @@
 from __future__ import annotations
 
 import asyncio
-import re
+import hashlib
+import time
+from collections import OrderedDict
 from typing import Protocol
 
 from fastapi import Depends
 
 from app.schemas.itinerary import Budget, BudgetItem, ItineraryRequest, ItineraryResponse
 from app.services.llm import LLMClient, get_llm_client
-from app.services.prompt import build_itinerary_prompt
+from app.services.prompt import PROMPT_TEMPLATE, build_itinerary_prompt
 from app.services.trip_repository import TripRepository, get_trip_repository
 
 
+# LLM results keyed by what the prompt contains (intent and locale). Identical requests
+# within the TTL reuse one completion, and concurrent ones share the in-flight call; every
+# request still saves its own trip. Only resolved results are cached: a future belongs to
+# the event loop that created it, so in-flight calls are shared within that loop only.
+ITINERARY_CACHE_TTL_SECONDS = 3600.0
+ITINERARY_CACHE_SIZE = 256
+_itinerary_cache: OrderedDict[str, tuple[float, dict[str, object]]] = OrderedDict()
+_itinerary_inflight: dict[str, asyncio.Future[dict[str, object]]] = {}
+
+
 class SpeechClient(Protocol):
     async def transcribe(self, audio_bytes: bytes) -> str: ...  # pragma: no cover
 
@@ -22,8 +34,7 @@ class ItineraryService:
         self._trip_repository = trip_repository
 
     async def generate_itinerary(self, payload: ItineraryRequest) -> ItineraryResponse:
-        prompt = build_itinerary_prompt(intent=payload.intent, locale=payload.locale)
-        llm_result = await self._llm_client.complete(prompt)
+        llm_result = await self._complete_cached(intent=payload.intent, locale=payload.locale)
 
         # Placeholder parsing logic until schema-based responses are implemented.
         itinerary_text = llm_result.get("itinerary", "行程规划暂未生成，请稍后重试。")
@@ -46,152 +57,52 @@ class ItineraryService:
                 user_id=payload.user_id,
                 intent=payload.intent,
                 itinerary=itinerary_text,
-                budget={
-                    "total": budget.total,
-                    "currency": budget.currency,
-                    "breakdown": [item.model_dump() for item in budget.breakdown],
-                },
+                budget=budget.model_dump(),
             )
 
         return ItineraryResponse(itinerary=itinerary_text, budget=budget, trip_id=trip_id)
 
-
-def _extract_locations_from_prompt(prompt: str) -> list[str]:
-    itinerary_text = prompt.split("行程文本:", 1)[1].strip() if "行程文本:" in prompt else prompt
-    lines = [line.strip().lstrip("- ") for line in itinerary_text.splitlines() if line.strip()]
-    verbs = [
-        "带孩子前往",
-        "带孩子去",
-        "前往",
-        "参观",
-        "游览",
-        "游玩",
-        "探索",
-        "抵达",
-        "入住",
-        "逛",
-        "体验",
-        "造访",
-    ]
-    suffixes = [
-        "附近酒店",
-        "酒店",
-        "主题餐厅",
-        "餐厅",
-        "附近",
-        "游玩一整天",
-        "游玩",
-        "探索",
-        "体验",
-        "纪念品",
-        "返程",
-        "享用寿司",
-        "游逛",
-        "商店",
-        "纪念品店",
-    ]
-    trailing_descriptors = ["动漫", "主题", "亲子", "体验", "路线"]
-
-    locations: list[str] = []
-    seen: set[str] = set()
-
-    for line in lines:
-        content = line.split("：", 1)[1].strip() if "：" in line else line
-        segments = [segment.strip() for segment in re.split(r"[，,。；;]", content) if segment.strip()]
-
-        for segment in segments:
-            phrase = segment
-            for verb in verbs:
-                if verb in phrase:
-                    phrase = phrase.split(verb, 1)[1]
-                    break
-            phrase = phrase.strip()
-            if phrase.startswith(("在", "于")):
-                phrase = phrase[1:].strip()
-            if not phrase:
-                continue
-
-            for suffix in suffixes:
-                if phrase.endswith(suffix) and len(phrase) > len(suffix):
-                    phrase = phrase[: -len(suffix)].strip()
-
-            phrase = phrase.strip("- 第天日1234567890")
-            if not phrase:
-                continue
-
-            match = re.search(r"[A-Za-z\u4e00-\u9fff·]{2,20}", phrase)
-            candidate = match.group(0).strip() if match else phrase
-            candidate = candidate.strip("第天日1234567890")
-            for descriptor in trailing_descriptors:
-                if candidate.endswith(descriptor) and len(candidate) > len(descriptor):
-                    candidate = candidate[: -len(descriptor)].strip()
-
-            if len(candidate) < 2:
-                continue
-
-            if not candidate or candidate in seen:
-                continue
-
-            seen.add(candidate)
-            locations.append(candidate)
-            if len(locations) >= 12:
-                return locations
-
-    return locations
-
-
-def _guess_primary_city(itinerary_text: str, locations: list[str]) -> str | None:
-    patterns = [
-        r"抵达(?P<city>[A-Za-z\u4e00-\u9fff·]{2,20})",
-        r"到达(?P<city>[A-Za-z\u4e00-\u9fff·]{2,20})",
-        r"入住(?P<city>[A-Za-z\u4e00-\u9fff·]{2,20})",
-        r"前往(?P<city>[A-Za-z\u4e00-\u9fff·]{2,20})",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, itinerary_text)
-        if match:
-            city = match.group("city").strip("，。、. \n")
-            if city:
-                return city
-
-    for location in locations:
-        candidate = location.strip()
-        if len(candidate) >= 2:
-            return candidate
-
-    return None
-
-
-async def default_llm_response(prompt: str) -> dict[str, object]:
-    """Fallback LLM response used when provider credentials are absent."""
-
-    await asyncio.sleep(0.1)
-
-    if "\"locations\"" in prompt and "行程文本" in prompt:
-        itinerary_text = prompt.split("行程文本:", 1)[1].strip() if "行程文本:" in prompt else prompt
-        locations = _extract_locations_from_prompt(prompt)
-        city = _guess_primary_city(itinerary_text, locations)
-        return {"locations": locations, "city": city}
-
-    return {
-        "itinerary": "1. 抵达并办理入住\n2. 探索城市主要景点\n3. 品尝当地特色美食",
-        "budget": {
-            "total": 8000,
-            "currency": "CNY",
-            "breakdown": [
-                {"category": "交通", "amount": 2000},
-                {"category": "住宿", "amount": 3000},
-                {"category": "餐饮", "amount": 1500},
-                {"category": "游玩", "amount": 1500},
-            ],
-        },
-    }
-
-
-class MockLLMClient:
-    async def complete(self, prompt: str) -> dict[str, object]:
-        return await default_llm_response(prompt)
+    async def _complete_cached(self, *, intent: str, locale: str) -> dict[str, object]:
+        key = _itinerary_cache_key(intent=intent, locale=locale)
+        entry = _itinerary_cache.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                _itinerary_cache.move_to_end(key)
+                return entry[1]
+            del _itinerary_cache[key]
+
+        future = _itinerary_inflight.get(key)
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            prompt = build_itinerary_prompt(intent=intent, locale=locale)
+            completion = self._llm_client.complete(prompt, system=PROMPT_TEMPLATE)
+            future = asyncio.ensure_future(completion)
+            _itinerary_inflight[key] = future
+            future.add_done_callback(lambda done: _finish_itinerary(key, done))
+
+        # Shielded so one disconnecting client does not cancel the shared completion.
+        return await asyncio.shield(future)
+
+
+def _itinerary_cache_key(*, intent: str, locale: str) -> str:
+    digest = hashlib.blake2b(f"{locale}\0{intent}".encode(), digest_size=16)
+    return digest.hexdigest()
+
+
+def _finish_itinerary(key: str, future: asyncio.Future[dict[str, object]]) -> None:
+    # A newer in-flight call for the key (e.g. on another loop) is left alone.
+    if _itinerary_inflight.get(key) is future:
+        del _itinerary_inflight[key]
+    # Failed or empty completions are not reused; ``exception()`` also marks a failure as
+    # retrieved when every waiter has gone away.
+    if future.cancelled() or future.exception() is not None:
+        return
+    result = future.result()
+    if not result:
+        return
+    _itinerary_cache[key] = (time.monotonic() + ITINERARY_CACHE_TTL_SECONDS, result)
+    _itinerary_cache.move_to_end(key)
+    if len(_itinerary_cache) > ITINERARY_CACHE_SIZE:
+        _itinerary_cache.popitem(last=False)
 
 
 def get_itinerary_service(
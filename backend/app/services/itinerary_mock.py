@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import os
+import re
+
+# Heuristic location extraction for the mock LLM. A phrase is cut after the first listed
+# verb it contains, then its longest matching suffix and any trailing descriptors are stripped.
+_VERBS = (
+    "带孩子前往",
+    "带孩子去",
+    "前往",
+    "参观",
+    "游览",
+    "游玩",
+    "探索",
+    "抵达",
+    "入住",
+    "逛",
+    "体验",
+    "造访",
+)
+_SUFFIXES = (
+    "附近酒店",
+    "酒店",
+    "主题餐厅",
+    "餐厅",
+    "附近",
+    "游玩一整天",
+    "游玩",
+    "探索",
+    "体验",
+    "纪念品",
+    "返程",
+    "享用寿司",
+    "游逛",
+    "商店",
+    "纪念品店",
+)
+# Longest first, so "附近酒店" wins over "酒店" regardless of the order listed above.
+_SUFFIXES_LONGEST_FIRST = tuple(sorted(_SUFFIXES, key=len, reverse=True))
+_DESCRIPTORS = ("动漫", "主题", "亲子", "体验", "路线")
+_SUFFIX_LENGTHS = tuple((suffix, len(suffix)) for suffix in _SUFFIXES_LONGEST_FIRST)
+_DESCRIPTOR_LENGTHS = tuple((descriptor, len(descriptor)) for descriptor in _DESCRIPTORS)
+# Phrases sharing no character with any verb's first character cannot contain a verb; the
+# set test and the tuple ``endswith`` calls below run in C and skip most per-word probes.
+_VERB_INITIALS = frozenset(verb[0] for verb in _VERBS)
+# Day markers ("第1天") and list numbering left around a place name.
+_TRIM_CHARS = "第天日0123456789"
+_PHRASE_TRIM_CHARS = "- " + _TRIM_CHARS
+_CITY_TRIM_CHARS = "，。、. \n"
+_SPLIT_RE = re.compile(r"[，,。；;]")
+_CANDIDATE_RE = re.compile(r"[A-Za-z\u4e00-\u9fff·]{2,20}")
+_CITY_RE = re.compile(r"(?:抵达|到达|入住|前往)(?P<city>[A-Za-z\u4e00-\u9fff·]{2,20})")
+# Short names ending in an administrative suffix ("北京市", "东京都") are taken as the city
+# without scanning the itinerary text.
+_CITY_SUFFIXES = ("市", "都", "区", "县")
+
+
+def _extract_locations_from_prompt(prompt: str) -> list[str]:
+    itinerary_text = prompt.split("行程文本:", 1)[1].strip() if "行程文本:" in prompt else prompt
+    lines = [line.strip().lstrip("- ") for line in itinerary_text.splitlines() if line.strip()]
+
+    locations: list[str] = []
+    seen: set[str] = set()
+    seen_add = seen.add
+    candidate_search = _CANDIDATE_RE.search
+
+    for line in lines:
+        content = line.split("：", 1)[1].strip() if "：" in line else line
+        for raw_segment in _SPLIT_RE.split(content):
+            phrase = raw_segment.strip()
+            if not phrase:
+                continue
+            if not _VERB_INITIALS.isdisjoint(phrase):
+                for verb in _VERBS:
+                    if verb in phrase:
+                        phrase = phrase.split(verb, 1)[1]
+                        break
+            phrase = phrase.strip()
+            if phrase.startswith(("在", "于")):
+                phrase = phrase[1:].strip()
+            if not phrase:
+                continue
+
+            if phrase.endswith(_SUFFIXES):
+                for suffix, length in _SUFFIX_LENGTHS:
+                    if len(phrase) > length and phrase.endswith(suffix):
+                        phrase = phrase[:-length].strip()
+                        break
+
+            phrase = phrase.strip(_PHRASE_TRIM_CHARS)
+            if not phrase:
+                continue
+
+            match = candidate_search(phrase)
+            candidate = match[0] if match else phrase
+            candidate = candidate.strip(_TRIM_CHARS)
+            if candidate.endswith(_DESCRIPTORS):
+                for descriptor, length in _DESCRIPTOR_LENGTHS:
+                    if len(candidate) > length and candidate.endswith(descriptor):
+                        candidate = candidate[:-length].strip()
+
+            if len(candidate) < 2:
+                continue
+
+            if not candidate or candidate in seen:
+                continue
+
+            seen_add(candidate)
+            locations.append(candidate)
+            if len(locations) >= 12:
+                return locations
+
+    return locations
+
+
+def _guess_primary_city(itinerary_text: str, locations: list[str]) -> str | None:
+    for location in locations:
+        if 2 <= len(location) <= 4 and location.endswith(_CITY_SUFFIXES):
+            return location
+
+    match = _CITY_RE.search(itinerary_text)
+    if match:
+        city = match.group("city").strip(_CITY_TRIM_CHARS)
+        if city:
+            return city
+
+    for location in locations:
+        candidate = location.strip()
+        if len(candidate) >= 2:
+            return candidate
+
+    return None
+
+
+async def default_llm_response(prompt: str) -> dict[str, object]:
+    """Fallback LLM response used when provider credentials are absent."""
+
+    if '"locations"' in prompt and "行程文本" in prompt:
+        itinerary_text = (
+            prompt.split("行程文本:", 1)[1].strip() if "行程文本:" in prompt else prompt
+        )
+        locations = _extract_locations_from_prompt(prompt)
+        city = _guess_primary_city(itinerary_text, locations)
+        return {"locations": locations, "city": city}
+
+    return {
+        "itinerary": "1. 抵达并办理入住\n2. 探索城市主要景点\n3. 品尝当地特色美食",
+        "budget": {
+            "total": 8000,
+            "currency": "CNY",
+            "breakdown": [
+                {"category": "交通", "amount": 2000},
+                {"category": "住宿", "amount": 3000},
+                {"category": "餐饮", "amount": 1500},
+                {"category": "游玩", "amount": 1500},
+            ],
+        },
+    }
+
+
+class MockLLMClient:
+    """Offline stand-in for the LLM in local development without provider credentials."""
+
+    def __init__(self) -> None:
+        environment = os.getenv("ENV", "dev")
+        if environment != "dev":
+            raise RuntimeError(
+                f"MockLLMClient is for local development only (ENV={environment}); "
+                "set MODELSCOPE_API_KEY or OPENAI_API_KEY"
+            )
+
+    async def complete(self, prompt: str, *, system: str | None = None) -> dict[str, object]:
+        return await default_llm_response(f"{system}\n{prompt}" if system else prompt)
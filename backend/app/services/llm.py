@@ -2,16 +2,22 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Protocol
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Protocol
 
 try:
     from openai import AsyncOpenAI
 except ImportError:  # pragma: no cover
     AsyncOpenAI = None  # type: ignore
 
+if TYPE_CHECKING:
+    from openai.types.chat import ChatCompletionMessageParam
+
 
 class LLMClient(Protocol):
-    async def complete(self, prompt: str) -> dict[str, object]: ...  # pragma: no cover
+    async def complete(
+        self, prompt: str, *, system: str | None = None
+    ) -> dict[str, object]: ...  # pragma: no cover
 
 
 DEFAULT_MODELSCOPE_BASE_URL = "https://api-inference.modelscope.cn/v1"
@@ -35,32 +41,54 @@ class ModelScopeLLMClient:
         self._client = AsyncOpenAI(api_key=api_key, base_url=effective_base_url)
         self._model = effective_model
 
-    async def complete(self, prompt: str) -> dict[str, object]:
+    async def stream(self, prompt: str, *, system: str | None = None) -> AsyncIterator[str]:
+        """Yield the completion text as the model generates it.
+
+        ``system`` carries the fixed task instructions; it precedes the per-request prompt so
+        consecutive calls share a cacheable prefix.
+        """
+        messages: list[ChatCompletionMessageParam] = [
+            {
+                "role": "system",
+                "content": "你是帮用户规划旅行的智能助手，请返回 JSON 格式的行程与预算。",
+            },
+        ]
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
         response = await self._client.chat.completions.create(
             model=self._model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "你是帮用户规划旅行的智能助手，请返回 JSON 格式的行程与预算。",
-                },
-                {"role": "user", "content": prompt},
-            ],
+            messages=messages,
             response_format={"type": "json_object"},
             temperature=0.3,
+            stream=True,
         )
 
-        choice = response.choices[0] if response.choices else None
-        content = choice.message.content if choice else None  # type: ignore[assignment]
+        async for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    async def complete(self, prompt: str, *, system: str | None = None) -> dict[str, object]:
+        # Streaming keeps the connection active during long generations, so a slow
+        # itinerary is not cut off by the read timeout waiting for one large body.
+        content = "".join([delta async for delta in self.stream(prompt, system=system)])
         if not content:
             return {}
 
         return json.loads(content)
 
+    async def aclose(self) -> None:
+        await self._client.close()
+
 
 def get_llm_client() -> LLMClient:
     api_key = os.getenv("MODELSCOPE_API_KEY") or os.getenv("OPENAI_API_KEY")
     if not api_key:
-        from app.services.itinerary import MockLLMClient
+        from app.services.itinerary_mock import MockLLMClient
 
         return MockLLMClient()
 
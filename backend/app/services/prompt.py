@@ -56,9 +56,13 @@ PROMPT_TEMPLATE = """
 """.strip()
 
 
+# The *_PROMPT constants are sent verbatim as system messages and the builders below only
+# produce the per-request user message, so every request shares an identical prompt prefix
+# that providers with prefix caching can reuse instead of re-encoding.
+
+
 def build_itinerary_prompt(*, intent: str, locale: str) -> str:
     return (
-        f"{PROMPT_TEMPLATE}\n"
         f"用户意图: {intent}\n"
         f"语言: {locale}"
     )
@@ -88,18 +92,12 @@ def build_expense_parse_prompt(
     currency_hint: str | None = None,
     date_hint: date | None = None,
 ) -> str:
-    hints: list[str] = []
-    if currency_hint:
-        hints.append(f"若未提及币种，请默认使用 {currency_hint.upper()}。")
-    if date_hint:
-        hints.append(f"若未提及日期，请默认发生日期为 {date_hint.isoformat()}。")
-
-    hint_block = "\n".join(hints)
-    hint_section = f"{hint_block}\n" if hint_block else ""
+    currency_line = f"若未提及币种，请默认使用 {currency_hint.upper()}。\n" if currency_hint else ""
+    date_line = f"若未提及日期，请默认发生日期为 {date_hint.isoformat()}。\n" if date_hint else ""
 
     return (
-        f"{EXPENSE_PARSE_PROMPT}\n"
-        f"{hint_section}"
+        f"{currency_line}"
+        f"{date_line}"
         f"用户描述: {content.strip()}"
     )
 
@@ -134,7 +132,4 @@ ITINERARY_LOCATIONS_PROMPT = """
 
 
 def build_itinerary_locations_prompt(*, itinerary: str, intent: str | None = None) -> str:
-    return (
-        f"{ITINERARY_LOCATIONS_PROMPT}\n"
-        f"行程文本:\n{itinerary.strip()}"
-    )
+    return f"行程文本:\n{itinerary.strip()}"
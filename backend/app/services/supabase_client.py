@@ -1,9 +1,23 @@
 from __future__ import annotations
 
-import json
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 import httpx
+from pydantic_core import from_json, to_json
+
+from app.core.config import get_settings
+
+# Fail fast when the pool is saturated instead of queueing behind slow requests.
+SUPABASE_TIMEOUT = httpx.Timeout(10.0, connect=2.0, write=5.0, pool=1.0)
+SUPABASE_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0
+)
+
+# One client per process so every repository call reuses pooled keep-alive connections
+# (and TLS sessions) to Supabase; closed from the application lifespan.
+_supabase_client: SupabaseClient | None = None
 
 
 class SupabaseClient:
@@ -16,48 +30,67 @@ class SupabaseClient:
             "Content-Type": "application/json",
             "Prefer": "return=representation",
         }
+        self._headers_view = MappingProxyType(self._headers)
+        self._http = httpx.AsyncClient(
+            base_url=f"{self._url}/",
+            headers=self._headers,
+            timeout=SUPABASE_TIMEOUT,
+            limits=SUPABASE_LIMITS,
+        )
 
     @property
-    def base_headers(self) -> dict[str, str]:
-        return self._headers.copy()
+    def base_headers(self) -> Mapping[str, str]:
+        return self._headers_view
+
+    @property
+    def is_closed(self) -> bool:
+        return self._http.is_closed
 
     async def post(self, path: str, data: Any) -> Any:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                f"{self._url}/{path.lstrip('/')}",
-                content=json.dumps(data, default=str),
-                headers=self._headers,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._http.post(path.lstrip("/"), content=to_json(data, fallback=str))
+        response.raise_for_status()
+        return from_json(response.content)
 
     async def get(self, path: str, params: dict[str, Any]) -> Any:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{self._url}/{path.lstrip('/')}",
-                params=params,
-                headers=self._headers,
-            )
-            response.raise_for_status()
-            return response.json()
+        return from_json(await self.get_raw(path, params))
+
+    async def get_raw(self, path: str, params: dict[str, Any]) -> bytes:
+        """Return the undecoded response body, for callers that validate JSON directly."""
+        response = await self._http.get(path.lstrip("/"), params=params)
+        response.raise_for_status()
+        return response.content
 
     async def patch(self, path: str, data: dict[str, Any]) -> Any:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.patch(
-                f"{self._url}/{path.lstrip('/')}",
-                content=json.dumps(data, default=str),
-                headers=self._headers,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._http.patch(path.lstrip("/"), content=to_json(data, fallback=str))
+        response.raise_for_status()
+        return from_json(response.content)
 
     async def delete(self, path: str) -> Any:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.delete(
-                f"{self._url}/{path.lstrip('/')}",
-                headers=self._headers,
-            )
-            response.raise_for_status()
-            if response.content:
-                return response.json()
-            return None
+        response = await self._http.delete(path.lstrip("/"))
+        response.raise_for_status()
+        if response.content:
+            return from_json(response.content)
+        return None
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+def get_supabase_client() -> SupabaseClient | None:
+    global _supabase_client
+    settings = get_settings()
+    if not settings.supabase_url or not settings.supabase_service_role_key:
+        return None
+    if _supabase_client is None or _supabase_client.is_closed:
+        _supabase_client = SupabaseClient(
+            url=settings.supabase_url,
+            service_role_key=settings.supabase_service_role_key,
+        )
+    return _supabase_client
+
+
+async def close_supabase_client() -> None:
+    global _supabase_client
+    if _supabase_client is not None:
+        await _supabase_client.aclose()
+        _supabase_client = None
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 60
+# After a Redis failure the cache is bypassed for this long, so a missing Redis does not add
+# a connection attempt to every request.
+RETRY_AFTER_SECONDS = 30.0
+
+_redis: Redis | None = None
+_retry_at = 0.0
+
+
+def expenses_cache_key(*, user_id: str, trip_id: str) -> str:
+    return f"expenses:{user_id}:{trip_id}"
+
+
+def trips_cache_key(*, user_id: str) -> str:
+    return f"trips:{user_id}"
+
+
+class TripCache:
+    """Cache-aside store for read-heavy repository queries.
+
+    Entries live in Redis hashes so every variant of a listing (e.g. different limits) can
+    be invalidated together by deleting one key.
+    """
+
+    def __init__(self, *, redis: Redis, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
+        self._redis = redis
+        self._ttl = ttl_seconds
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= _retry_at
+
+    async def get(self, key: str, field: str) -> bytes | None:
+        if not self.available:
+            return None
+        try:
+            value = await self._redis.hget(key, field)
+        except (RedisError, OSError) as exc:
+            _back_off(exc)
+            return None
+        # The client is created without ``decode_responses``, so values arrive as bytes.
+        return value.encode() if isinstance(value, str) else value
+
+    async def set(self, key: str, field: str, value: bytes) -> None:
+        if not self.available:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.hset(key, field, value)
+                pipe.expire(key, self._ttl)
+                await pipe.execute()
+        except (RedisError, OSError) as exc:
+            _back_off(exc)
+
+    async def delete(self, key: str) -> None:
+        # Always attempt invalidation, even while backing off, so a recovered Redis never
+        # serves rows written during the outage.
+        try:
+            await self._redis.delete(key)
+        except (RedisError, OSError) as exc:
+            _back_off(exc)
+
+
+def _back_off(exc: Exception) -> None:
+    global _retry_at
+    if time.monotonic() >= _retry_at:
+        logger.warning("Redis cache unavailable, bypassing for %.0fs: %s", RETRY_AFTER_SECONDS, exc)
+    _retry_at = time.monotonic() + RETRY_AFTER_SECONDS
+
+
+def get_trip_cache() -> TripCache | None:
+    global _redis
+    settings = get_settings()
+    if not settings.redis_url:
+        return None
+    if _redis is None:
+        _redis = Redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+    return TripCache(redis=_redis)
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+
 from fastapi import Depends
 
 from app.schemas.map import MapCoordinate, MapPoint, MapSegment, TripMapResponse
 from app.services.baidu_maps import BaiduMapsClient, get_baidu_maps_client
 from app.services.llm import LLMClient, get_llm_client
-from app.services.prompt import build_itinerary_locations_prompt
+from app.services.prompt import ITINERARY_LOCATIONS_PROMPT, build_itinerary_locations_prompt
 from app.services.trip_repository import TripRepository, get_trip_repository
 
+# Concurrent geocode requests per map build; keeps a long itinerary within Baidu's QPS quota.
+GEOCODE_CONCURRENCY = 8
+
 
 class TripMapService:
     def __init__(
@@ -20,6 +25,7 @@ class TripMapService:
         self._trip_repository = trip_repository
         self._maps_client = maps_client
         self._llm_client = llm_client
+        self._geocode_semaphore = asyncio.Semaphore(GEOCODE_CONCURRENCY)
 
     @property
     def maps_enabled(self) -> bool:
@@ -38,27 +44,32 @@ class TripMapService:
         if not locations:
             return TripMapResponse(tripId=trip_id, city=city, points=[])
 
-        points: list[MapPoint] = []
-        for location_name in locations:
-            point = await self._geocode_location(name=location_name, city=city)
-            if point is not None:
-                points.append(point)
-
-        segments: list[MapSegment] = []
-        if len(points) >= 2:
-            for index in range(len(points) - 1):
-                start = points[index]
-                end = points[index + 1]
-                segments.append(
-                    MapSegment(
-                        startIndex=index,
-                        endIndex=index + 1,
-                        coordinates=[
-                            MapCoordinate(lat=start.lat, lng=start.lng),
-                            MapCoordinate(lat=end.lat, lng=end.lng),
-                        ],
-                    )
-                )
+        # Repeated stops (the hotel, a revisited landmark) are geocoded once; concurrent
+        # duplicates would all miss the geocode cache. One failing lookup drops that
+        # location instead of the whole map.
+        unique_locations = list(dict.fromkeys(locations))
+        results = await asyncio.gather(
+            *(self._geocode_location(name=name, city=city) for name in unique_locations),
+            return_exceptions=True,
+        )
+        resolved = {
+            name: point
+            for name, point in zip(unique_locations, results)
+            if isinstance(point, MapPoint)
+        }
+        points = [resolved[name] for name in locations if name in resolved]
+
+        segments = [
+            MapSegment(
+                startIndex=index,
+                endIndex=index + 1,
+                coordinates=[
+                    MapCoordinate(lat=start.lat, lng=start.lng),
+                    MapCoordinate(lat=end.lat, lng=end.lng),
+                ],
+            )
+            for index, (start, end) in enumerate(zip(points, points[1:]))
+        ]
 
         return TripMapResponse(tripId=trip_id, city=city, points=points, segments=segments)
 
@@ -68,7 +79,7 @@ class TripMapService:
 
         prompt = build_itinerary_locations_prompt(itinerary=itinerary)
         try:
-            llm_result = await self._llm_client.complete(prompt)
+            llm_result = await self._llm_client.complete(prompt, system=ITINERARY_LOCATIONS_PROMPT)
         except Exception:  # pragma: no cover - LLM failures
             return [], None
 
@@ -106,7 +117,8 @@ class TripMapService:
         name: str,
         city: str | None,
     ) -> MapPoint | None:
-        geocode = await self._maps_client.geocode(address=name, city=city)
+        async with self._geocode_semaphore:
+            geocode = await self._maps_client.geocode(address=name, city=city)
         if not geocode:
             return None
 
@@ -1,59 +1,33 @@
 from __future__ import annotations
 
-from typing import Any
+import math
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import from_json
 
-from app.core.config import get_settings
 from app.schemas.expense import ExpenseResponse
 from app.schemas.trip import TripDetailResponse, TripResponse
-from app.services.supabase_client import SupabaseClient
+from app.services.supabase_client import SupabaseClient, get_supabase_client
+from app.services.trip_cache import TripCache, expenses_cache_key, get_trip_cache, trips_cache_key
+
+EXPENSE_ORDER = "occurred_on.desc,created_at.desc"
+
+_EXPENSES_ADAPTER = TypeAdapter(list[ExpenseResponse])
+_TRIPS_ADAPTER = TypeAdapter(list[TripResponse])
+
+RowT = TypeVar("RowT", bound=BaseModel)
 
 
 class TripRepository:
-    def __init__(self, *, supabase_url: str | None, service_role_key: str | None) -> None:
-        self._client: SupabaseClient | None = None
-        if supabase_url and service_role_key:
-            self._client = SupabaseClient(url=supabase_url, service_role_key=service_role_key)
+    def __init__(self, *, client: SupabaseClient | None, cache: TripCache | None = None) -> None:
+        self._client = client
+        self._cache = cache
 
     @property
     def enabled(self) -> bool:
         return self._client is not None
 
-    async def _fetch_trip_row(self, trip_id: str, user_id: str | None = None) -> dict[str, Any] | None:
-        if not self._client:
-            return None
-
-        params: dict[str, Any] = {"id": f"eq.{trip_id}", "limit": 1}
-        if user_id:
-            params["owner_id"] = f"eq.{user_id}"
-
-        try:
-            rows = await self._client.get("rest/v1/trips", params)
-        except Exception:
-            return None
-
-        if isinstance(rows, list) and rows:
-            return rows[0]
-        return None
-
-    async def _fetch_expense_row(self, expense_id: str) -> dict[str, Any] | None:
-        if not self._client:
-            return None
-
-        params = {
-            "id": f"eq.{expense_id}",
-            "select": "*,trip:trips(id,owner_id,total_budget)",
-            "limit": 1,
-        }
-
-        try:
-            rows = await self._client.get("rest/v1/expenses", params)
-        except Exception:
-            return None
-
-        if isinstance(rows, list) and rows:
-            return rows[0]
-        return None
-
     async def save_trip(
         self,
         *,
@@ -86,6 +60,9 @@ class TripRepository:
         except Exception:
             return None
 
+        if self._cache:
+            await self._cache.delete(trips_cache_key(user_id=user_id))
+
         if isinstance(data, list) and data:
             return data[0].get("id")
         if isinstance(data, dict):
@@ -96,6 +73,12 @@ class TripRepository:
         if not self._client:
             return []
 
+        cache_key = trips_cache_key(user_id=user_id)
+        if self._cache:
+            cached = await self._cache.get(cache_key, str(limit))
+            if cached is not None:
+                return _TRIPS_ADAPTER.validate_json(cached)
+
         params = {
             "owner_id": f"eq.{user_id}",
             "order": "created_at.desc",
@@ -103,33 +86,48 @@ class TripRepository:
         }
 
         try:
-            rows = await self._client.get("rest/v1/trips", params)
+            raw = await self._client.get_raw("rest/v1/trips", params)
         except Exception:
             return []
 
-        if not isinstance(rows, list):
-            return []
-
-        trips: list[TripResponse] = []
-        for row in rows:
-            try:
-                trips.append(TripResponse.model_validate(row))
-            except ValueError:
-                continue
+        trips = _validate_rows(raw, _TRIPS_ADAPTER, TripResponse)
+        if self._cache:
+            await self._cache.set(cache_key, str(limit), _TRIPS_ADAPTER.dump_json(trips))
         return trips
 
     async def fetch_trip_detail(self, *, user_id: str, trip_id: str) -> TripDetailResponse | None:
-        row = await self._fetch_trip_row(trip_id, user_id)
-        if not row:
+        if not self._client:
             return None
 
+        # Trip and its expenses in one PostgREST request via an embedded select, instead of
+        # fetching the trip, re-fetching it for the ownership check and then the expenses.
+        params: dict[str, Any] = {
+            "id": f"eq.{trip_id}",
+            "select": "*,expenses(*)",
+            "expenses.order": EXPENSE_ORDER,
+            "limit": 1,
+        }
+        if user_id:
+            params["owner_id"] = f"eq.{user_id}"
+
+        try:
+            rows = await self._client.get("rest/v1/trips", params)
+        except Exception:
+            return None
+
+        if not isinstance(rows, list) or not rows:
+            return None
+
+        row = rows[0]
+        expense_rows = row.pop("expenses", None)
+
         try:
             trip = TripDetailResponse.model_validate(row)
         except ValueError:
             return None
 
-        expenses = await self.list_expenses(trip_id=trip_id, user_id=user_id)
-        total_expenses = sum(expense.amount for expense in expenses)
+        expenses = _parse_rows(expense_rows, ExpenseResponse)
+        total_expenses = math.fsum(expense.amount for expense in expenses)
         remaining_budget = trip.total_budget - total_expenses if trip.total_budget is not None else None
 
         return trip.model_copy(
@@ -144,29 +142,30 @@ class TripRepository:
         if not self._client:
             return []
 
-        trip_row = await self._fetch_trip_row(trip_id, user_id)
-        if not trip_row:
-            return []
+        # Keyed by owner as well as trip: a hit implies the owner filter below matched.
+        cache_key = expenses_cache_key(user_id=user_id, trip_id=trip_id)
+        if self._cache:
+            cached = await self._cache.get(cache_key, "all")
+            if cached is not None:
+                return _EXPENSES_ADAPTER.validate_json(cached)
 
+        # Ownership is enforced inside the query: the inner-joined trip embed drops every row
+        # whose trip is not the caller's. The embedded ``trip`` key is ignored on validation.
         params = {
             "trip_id": f"eq.{trip_id}",
-            "order": "occurred_on.desc,created_at.desc",
+            "select": "*,trip:trips!inner(owner_id)",
+            "trip.owner_id": f"eq.{user_id}",
+            "order": EXPENSE_ORDER,
         }
 
         try:
-            rows = await self._client.get("rest/v1/expenses", params)
+            raw = await self._client.get_raw("rest/v1/expenses", params)
         except Exception:
             return []
 
-        if not isinstance(rows, list):
-            return []
-
-        expenses: list[ExpenseResponse] = []
-        for row in rows:
-            try:
-                expenses.append(ExpenseResponse.model_validate(row))
-            except ValueError:
-                continue
+        expenses = _validate_rows(raw, _EXPENSES_ADAPTER, ExpenseResponse)
+        if self._cache:
+            await self._cache.set(cache_key, "all", _EXPENSES_ADAPTER.dump_json(expenses))
         return expenses
 
     async def add_expense(
@@ -182,23 +181,27 @@ class TripRepository:
         if not self._client:
             return None
 
-        trip_row = await self._fetch_trip_row(trip_id, user_id)
-        if not trip_row:
-            return None
-
+        # The service-role key bypasses RLS, so ownership is enforced inside the SQL
+        # functions (see supabase/schema.sql); each write is a single round trip.
         payload = {
-            "trip_id": trip_id,
-            "category": category,
-            "amount": amount,
-            "currency": currency,
-            "occurred_on": occurred_on,
+            "p_owner_id": user_id,
+            "p_trip_id": trip_id,
+            "p_category": category,
+            "p_amount": amount,
+            "p_currency": currency,
+            "p_occurred_on": occurred_on,
         }
 
         try:
-            data = await self._client.post("rest/v1/expenses", payload)
+            data = await self._client.post("rest/v1/rpc/add_trip_expense", payload)
         except Exception:
             return None
 
+        if not data:
+            return None
+
+        await self._invalidate_expenses(user_id=user_id, trip_id=trip_id)
+
         record: dict[str, Any] | None = None
         if isinstance(data, list) and data:
             record = data[0]
@@ -223,22 +226,10 @@ class TripRepository:
         if not self._client:
             return None
 
-        record = await self._fetch_expense_row(expense_id)
-        trip = record.get("trip") if record else None
-        if not record or not trip or trip.get("owner_id") != user_id:
-            return None
-
-        if isinstance(record, dict):
-            record.pop("trip", None)
-
-        if not updates:
-            try:
-                return ExpenseResponse.model_validate(record)
-            except ValueError:
-                return None
+        payload = {"p_owner_id": user_id, "p_expense_id": expense_id, "p_updates": updates}
 
         try:
-            data = await self._client.patch(f"rest/v1/expenses?id=eq.{expense_id}", updates)
+            data = await self._client.post("rest/v1/rpc/update_trip_expense", payload)
         except Exception:
             return None
 
@@ -251,8 +242,7 @@ class TripRepository:
         if not updated:
             return None
 
-        if isinstance(updated, dict):
-            updated.pop("trip", None)
+        await self._invalidate_expenses(user_id=user_id, trip_id=updated.get("trip_id"))
 
         try:
             return ExpenseResponse.model_validate(updated)
@@ -268,22 +258,51 @@ class TripRepository:
         if not self._client:
             return False
 
-        record = await self._fetch_expense_row(expense_id)
-        trip = record.get("trip") if record else None
-        if not record or not trip or trip.get("owner_id") != user_id:
-            return False
+        payload = {"p_owner_id": user_id, "p_expense_id": expense_id}
 
         try:
-            await self._client.delete(f"rest/v1/expenses?id=eq.{expense_id}")
+            data = await self._client.post("rest/v1/rpc/delete_trip_expense", payload)
         except Exception:
             return False
 
+        if not isinstance(data, list) or not data:
+            return False
+
+        await self._invalidate_expenses(user_id=user_id, trip_id=data[0].get("trip_id"))
         return True
 
+    async def _invalidate_expenses(self, *, user_id: str, trip_id: str | None) -> None:
+        if self._cache and trip_id:
+            await self._cache.delete(expenses_cache_key(user_id=user_id, trip_id=trip_id))
+
+
+def _validate_rows(raw: bytes, adapter: TypeAdapter[list[RowT]], model: type[RowT]) -> list[RowT]:
+    # The whole body is validated in one pydantic-core pass; only when some row is malformed
+    # does it fall back to per-row validation so the remaining rows are still returned.
+    try:
+        return adapter.validate_json(raw)
+    except ValueError:
+        pass
+
+    try:
+        rows = from_json(raw)
+    except ValueError:
+        return []
+    return _parse_rows(rows, model)
+
+
+def _parse_rows(rows: Any, model: type[RowT]) -> list[RowT]:
+    if not isinstance(rows, list):
+        return []
+
+    parsed: list[RowT] = []
+    for row in rows:
+        try:
+            parsed.append(model.model_validate(row))
+        except ValueError:
+            continue
+    return parsed
+
 
 def get_trip_repository() -> TripRepository:
-    settings = get_settings()
-    return TripRepository(
-        supabase_url=settings.supabase_url,
-        service_role_key=settings.supabase_service_role_key,
-    )
+    return TripRepository(client=get_supabase_client(), cache=get_trip_cache())
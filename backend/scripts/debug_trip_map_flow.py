@@ -3,22 +3,70 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
+import logging
+import logging.handlers
+import mmap
+import os
+import queue
+import re
+import sqlite3
 import sys
+import time
+from collections.abc import Callable
+from contextlib import AsyncExitStack
+from contextvars import ContextVar
 from pathlib import Path
-from textwrap import dedent
 from typing import Any
 
 import httpx
+from pydantic_core import from_json
+
+try:
+	import uvloop  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - only installed with uvicorn[standard]
+	uvloop = None  # type: ignore
 
 from app.core.config import get_settings
-from app.schemas.map import MapCoordinate, MapSegment, TripMapResponse
-from app.services.baidu_maps import BAIDU_GEOCODE_ENDPOINT, BaiduMapsClient
-from app.services.itinerary import MockLLMClient
+from app.schemas.map import MapCoordinate, MapPoint, MapSegment, TripMapResponse
+from app.services.baidu_maps import (
+	BAIDU_GEOCODE_ENDPOINT,
+	BaiduMapsClient,
+	close_http_client,
+	get_http_client,
+)
+from app.services.itinerary_mock import MockLLMClient
 from app.services.llm import ModelScopeLLMClient, get_llm_client
-from app.services.prompt import build_itinerary_locations_prompt
+from app.services.prompt import ITINERARY_LOCATIONS_PROMPT, build_itinerary_locations_prompt
 from app.services.trip_map import TripMapService
 
 
+logger = logging.getLogger("debug_trip_map_flow")
+
+# Geocode results persist across runs so re-debugging the same itinerary does not hit Baidu
+# again; pass --no-cache to always query the API.
+GEOCODE_CACHE_PATH = Path.home() / ".cache" / "trip_map" / "geocode.sqlite3"
+
+# Baidu enforces a per-key QPS quota; requests are spaced to stay under it, and a 429 is
+# retried with exponential backoff (1s, 2s, 4s) before giving up.
+DEFAULT_GEOCODE_QPS = 10.0
+GEOCODE_MAX_ATTEMPTS = 4
+
+# Day headings ("- 第2天：", "Day 3") that start a new chunk of the itinerary.
+_DAY_SPLIT_RE = re.compile(r"^(?=[-*\s]*(?:第[一二三四五六七八九十0-9]+天|Day \d+))", re.MULTILINE)
+
+# Geocodes run concurrently, so each task collects its log lines here and the caller prints
+# them in location order once every lookup has finished.
+_task_output: ContextVar[list[str] | None] = ContextVar("_task_output", default=None)
+
+
+def _log(message: str) -> None:
+	buffer = _task_output.get()
+	if buffer is None:
+		logger.info(message)
+	else:
+		buffer.append(message)
+
+
 class _NullTripRepository:
 	"""Placeholder repository so the map service can be instantiated."""
 
@@ -26,66 +74,136 @@ class _NullTripRepository:
 		raise NotImplementedError("Trip repository is not used in debug script")
 
 
+class _RateLimiter:
+	"""Spaces successive ``wait()`` returns at least ``1 / rate`` seconds apart."""
+
+	def __init__(self, rate: float) -> None:
+		self._interval = 1.0 / rate
+		self._next_at = 0.0
+
+	async def wait(self) -> None:
+		# Each caller reserves the next free slot before sleeping, so concurrent callers
+		# queue up behind one another without a lock.
+		now = time.monotonic()
+		slot = max(now, self._next_at)
+		self._next_at = slot + self._interval
+		if slot > now:
+			await asyncio.sleep(slot - now)
+
+
+def _open_geocode_cache(path: Path) -> sqlite3.Connection:
+	path.parent.mkdir(parents=True, exist_ok=True)
+	conn = sqlite3.connect(path)
+	conn.execute(
+		"CREATE TABLE IF NOT EXISTS geo ("
+		"address TEXT, city TEXT, payload TEXT, ts INTEGER, PRIMARY KEY (address, city))"
+	)
+	return conn
+
+
 class DebugBaiduMapsClient(BaiduMapsClient):
+	def __init__(
+		self,
+		*,
+		api_key: str | None,
+		client: httpx.AsyncClient | None = None,
+		cache: sqlite3.Connection | None = None,
+		verbose: bool = False,
+		qps: float = DEFAULT_GEOCODE_QPS,
+	) -> None:
+		super().__init__(api_key=api_key, client=client)
+		self._cache = cache
+		self._verbose = verbose
+		self._limiter = _RateLimiter(qps)
+		# Constant for the client's lifetime; each lookup only adds its address and city.
+		self._base_params = {"output": "json", "ak": api_key}
+
+	def _log_result(self, label: str, result: dict[str, Any]) -> None:
+		# Pretty-printed dumps only with --verbose; otherwise one summary line per lookup.
+		if self._verbose:
+			_log(f"{label}:")
+			_log(json.dumps(result, ensure_ascii=False, indent=2))
+		else:
+			_log(
+				f"{label}: ({result['lat']}, {result['lng']}) "
+				f"confidence={result.get('confidence')} address={result.get('address')}"
+			)
+
 	async def geocode(self, *, address: str, city: str | None = None) -> dict[str, Any] | None:
-		print("\n--- Baidu Geocode Request ---")
-		print(json.dumps({"address": address, "city": city}, ensure_ascii=False, indent=2))
+		_log("\n--- Baidu Geocode Request ---")
+		request = {"address": address, "city": city}
+		_log(json.dumps(request, ensure_ascii=False, indent=2 if self._verbose else None))
 
 		if not self.enabled:
-			print("Baidu Maps client disabled (missing BAIDU_MAP_AK). Skipping request.")
+			_log("Baidu Maps client disabled (missing BAIDU_MAP_AK). Skipping request.")
 			return None
 
-		params = {
-			"address": address,
-			"output": "json",
-			"ak": self._api_key,
-		}
+		if self._cache is not None:
+			# NULL never equals NULL in a primary key, so a missing city is stored as "".
+			row = self._cache.execute(
+				"SELECT payload FROM geo WHERE address = ? AND city = ?", (address, city or "")
+			).fetchone()
+			if row:
+				cached: dict[str, Any] = json.loads(row[0])
+				self._log_result("Cached geocode result", cached)
+				return cached
+
+		params = {**self._base_params, "address": address}
 		if city:
 			params["city"] = city
 
-		try:
-			response = await self._client.get(BAIDU_GEOCODE_ENDPOINT, params=params)
-		except httpx.HTTPError as exc:  # pragma: no cover - network failure path
-			print(f"HTTP request failed: {exc}")
-			return None
-
-		print(f"HTTP status: {response.status_code}")
-		print("Response body:")
-		print(response.text)
+		for attempt in range(GEOCODE_MAX_ATTEMPTS):
+			await self._limiter.wait()
+			try:
+				response = await self._client.get(BAIDU_GEOCODE_ENDPOINT, params=params)
+			except httpx.HTTPError as exc:  # pragma: no cover - network failure path
+				_log(f"HTTP request failed: {exc}")
+				return None
+			if response.status_code != 429 or attempt == GEOCODE_MAX_ATTEMPTS - 1:
+				break
+			delay = 2**attempt
+			_log(f"HTTP 429 from Baidu; retrying in {delay}s.")
+			await asyncio.sleep(delay)
+
+		_log(f"HTTP status: {response.status_code}")
+		if self._verbose:
+			_log("Response body:")
+			_log(response.text)
 
 		try:
 			response.raise_for_status()
 		except httpx.HTTPStatusError as exc:
-			print(f"HTTP status error: {exc}")
+			_log(f"HTTP status error: {exc}")
 			return None
 
 		try:
-			data = response.json()
+			data = from_json(response.content)
 		except ValueError:
-			print("Failed to decode JSON response.")
+			_log("Failed to decode JSON response.")
 			return None
 
-		print("Parsed JSON:")
-		print(json.dumps(data, ensure_ascii=False, indent=2))
+		if self._verbose:
+			_log("Parsed JSON:")
+			_log(json.dumps(data, ensure_ascii=False, indent=2))
 
 		if not isinstance(data, dict) or data.get("status") != 0:
-			print("Baidu geocode reported an error status.")
+			_log("Baidu geocode reported an error status.")
 			return None
 
 		result = data.get("result")
 		if not isinstance(result, dict):
-			print("Unexpected result payload.")
+			_log("Unexpected result payload.")
 			return None
 
 		location = result.get("location")
 		if not isinstance(location, dict):
-			print("Missing location field in result.")
+			_log("Missing location field in result.")
 			return None
 
 		lat = location.get("lat")
 		lng = location.get("lng")
 		if lat is None or lng is None:
-			print("Missing latitude or longitude in response.")
+			_log("Missing latitude or longitude in response.")
 			return None
 
 		parsed: dict[str, Any] = {
@@ -97,66 +215,195 @@ class DebugBaiduMapsClient(BaiduMapsClient):
 			"address": result.get("formatted_address") or result.get("name"),
 		}
 
-		print("Sanitized geocode result:")
-		print(json.dumps(parsed, ensure_ascii=False, indent=2))
+		self._log_result("Sanitized geocode result", parsed)
+
+		if self._cache is not None:
+			with self._cache:
+				self._cache.execute(
+					"INSERT OR REPLACE INTO geo VALUES (?, ?, ?, ?)",
+					(address, city or "", json.dumps(parsed, ensure_ascii=False), int(time.time())),
+				)
 		return parsed
 
 
-async def _extract_locations_with_logging(service: TripMapService, itinerary: str) -> tuple[list[str], str | None]:
-	prompt = build_itinerary_locations_prompt(itinerary=itinerary)
-	print("--- Prompt Sent To LLM ---")
-	print(dedent(prompt))
-	print("--- End Prompt ---\n")
+def _split_itinerary_days(itinerary: str) -> list[str]:
+	return [day.strip() for day in _DAY_SPLIT_RE.split(itinerary) if day.strip()]
 
-	if service._llm_client is None:  # type: ignore[attr-defined]
-		print("LLM client not configured; returning empty list.")
-		return [], None
 
-	try:
-		llm_raw = await service._llm_client.complete(prompt)  # type: ignore[attr-defined]
-	except Exception as exc:  # pragma: no cover - LLM failure path
-		print(f"LLM call failed: {exc}")
-		return [], None
+def _coordinate(value: Any) -> float | None:
+	if isinstance(value, (int, float)) and not isinstance(value, bool):
+		return float(value)
+	return None
 
-	print("--- Raw LLM Response ---")
-	try:
-		print(json.dumps(llm_raw, ensure_ascii=False, indent=2))
-	except TypeError:
-		print(f"Non-serializable LLM output: {llm_raw}")
-	print("--- End LLM Response ---\n")
 
+def _parse_city(value: Any) -> str | None:
+	if isinstance(value, str):
+		return value.strip() or None
+	return None
+
+
+def _parse_location_item(item: Any) -> tuple[str | None, MapPoint | None]:
+	"""Return an entry's name and, when the LLM already placed it, its point."""
+	if isinstance(item, str):
+		return item.strip() or None, None
+	if not isinstance(item, dict):
+		return None, None
+
+	value = item.get("name")
+	name = value.strip() if isinstance(value, str) else ""
+	if not name:
+		return None, None
+
+	lat = _coordinate(item.get("lat"))
+	lng = _coordinate(item.get("lng"))
+	if lat is None or lng is None:
+		return name, None
+	return name, MapPoint(name=name, lat=lat, lng=lng, sourceText=name)
+
+
+# (locations in order, city, points the LLM already placed) for one LLM response.
+ParsedLocations = tuple[list[str], str | None, dict[str, MapPoint]]
+
+
+def _parse_llm_locations(llm_raw: Any) -> ParsedLocations:
 	locations: list[str] = []
 	city: str | None = None
+	# Locations the LLM already placed ({"name", "lat", "lng"}); these skip geocoding.
+	provided: dict[str, MapPoint] = {}
 
 	if isinstance(llm_raw, dict):
 		candidate = llm_raw.get("locations")
 		if isinstance(candidate, list):
 			for item in candidate:
-				name: str | None = None
+				# Plain names are by far the common shape; only dict entries need the full parse.
 				if isinstance(item, str):
-					name = item.strip()
-				elif isinstance(item, dict):
-					value = item.get("name")
-					if isinstance(value, str):
-						name = value.strip()
+					if stripped := item.strip():
+						locations.append(stripped)
+					continue
 
+				name, point = _parse_location_item(item)
 				if name:
 					locations.append(name)
+				if name and point is not None:
+					provided.setdefault(name, point)
+
+		city = _parse_city(llm_raw.get("city"))
+
+	return locations, city, provided
+
+
+# Called with (name, city, point) as soon as a location is known; ``point`` is set when the
+# LLM supplied coordinates. The same name may be reported more than once.
+LocationCallback = Callable[[str, str | None, MapPoint | None], None]
+
+
+async def _complete_locations(llm_client: Any, prompt: str, on_location: LocationCallback) -> Any:
+	if not isinstance(llm_client, ModelScopeLLMClient):
+		return await llm_client.complete(prompt, system=ITINERARY_LOCATIONS_PROMPT)
+
+	# Streamed responses are re-parsed as partial JSON after every delta so geocoding can
+	# start while the model is still generating. Every array element but the last is
+	# complete, and elements are only released once the response's "city" has arrived.
+	content = ""
+	released = 0
+	async for delta in llm_client.stream(prompt, system=ITINERARY_LOCATIONS_PROMPT):
+		content += delta
+		try:
+			partial = from_json(content, allow_partial=True)
+		except ValueError:
+			continue
+		if not isinstance(partial, dict) or "city" not in partial:
+			continue
+		items = partial.get("locations")
+		if not isinstance(items, list):
+			continue
+		city = _parse_city(partial["city"])
+		for item in items[released:-1]:
+			name, point = _parse_location_item(item)
+			if name:
+				on_location(name, city, point)
+		released = max(released, len(items) - 1)
+
+	return json.loads(content) if content else {}
+
+
+async def _extract_locations_with_logging(
+	service: TripMapService, itinerary: str, on_location: LocationCallback
+) -> ParsedLocations:
+	# Multi-day itineraries are sent one day per prompt so the shorter generations run
+	# concurrently; a single-day itinerary is sent whole.
+	days = _split_itinerary_days(itinerary)
+	prompts = [
+		build_itinerary_locations_prompt(itinerary=day)
+		for day in (days if len(days) > 1 else [itinerary])
+	]
+	for index, prompt in enumerate(prompts):
+		logger.info("--- Prompt Sent To LLM ---")
+		logger.info(f"{ITINERARY_LOCATIONS_PROMPT}\n{prompt}" if index == 0 else prompt)
+		logger.info("--- End Prompt ---\n")
 
-		city_candidate = llm_raw.get("city")
-		if isinstance(city_candidate, str):
-			stripped = city_candidate.strip()
-			if stripped:
-				city = stripped
-		elif city_candidate is None:
-			city = None
+	if service._llm_client is None:  # type: ignore[attr-defined]
+		logger.info("LLM client not configured; returning empty list.")
+		return [], None, {}
+
+	llm_client = service._llm_client  # type: ignore[attr-defined]
+
+	async def complete_day(prompt: str) -> tuple[Any, ParsedLocations]:
+		llm_raw = await _complete_locations(llm_client, prompt, on_location)
+		parsed = _parse_llm_locations(llm_raw)
+		day_locations, day_city, day_provided = parsed
+		for name in day_locations:
+			on_location(name, day_city, day_provided.get(name))
+		return llm_raw, parsed
+
+	responses = await asyncio.gather(
+		*(complete_day(prompt) for prompt in prompts),
+		return_exceptions=True,
+	)
 
-	print("Extracted locations (ordered):")
+	locations: list[str] = []
+	city: str | None = None
+	provided: dict[str, MapPoint] = {}
+
+	for response in responses:
+		if isinstance(response, BaseException):  # pragma: no cover - LLM failure path
+			logger.error(f"LLM call failed: {response}")
+			continue
+
+		llm_raw, (day_locations, day_city, day_provided) = response
+		logger.info("--- Raw LLM Response ---")
+		try:
+			logger.info(json.dumps(llm_raw, ensure_ascii=False, indent=2))
+		except TypeError:
+			logger.info(f"Non-serializable LLM output: {llm_raw}")
+		logger.info("--- End LLM Response ---\n")
+
+		# Locations keep itinerary order; the first day that names a city decides it.
+		locations.extend(day_locations)
+		city = city or day_city
+		for name, point in day_provided.items():
+			provided.setdefault(name, point)
+
+	logger.info("Extracted locations (ordered):")
 	for idx, location in enumerate(locations, start=1):
-		print(f"  {idx}. {location}")
-	print(f"Detected primary city: {city or '未识别'}")
+		logger.info(f"  {idx}. {location}")
+	logger.info(f"Detected primary city: {city or '未识别'}")
+
+	return locations, city, provided
+
 
-	return locations, city
+async def _geocode_with_logging(
+	service: TripMapService, location: str, city: str | None
+) -> tuple[MapPoint | None, list[str]]:
+	output = [f"\n=== Geocoding location: {location} ==="]
+	_task_output.set(output)
+	point = await service._geocode_location(name=location, city=city)
+	output.append("Map point result:")
+	if point is None:
+		output.append("  Geocoding failed; no point produced.")
+	else:
+		output.append(point.model_dump_json(indent=2))
+	return point, output
 
 
 def _create_llm_client(args: argparse.Namespace):
@@ -164,70 +411,124 @@ def _create_llm_client(args: argparse.Namespace):
 		try:
 			return ModelScopeLLMClient(api_key=args.api_key, base_url=args.llm_base_url, model=args.llm_model)
 		except Exception as exc:
-			print(f"Failed to initialize LLM client with provided API key: {exc}")
+			logger.error(f"Failed to initialize LLM client with provided API key: {exc}")
 			sys.exit(2)
 
 	return get_llm_client()
 
 
-async def debug_flow(itinerary: str, args: argparse.Namespace) -> TripMapResponse:
-	settings = get_settings()
-	llm_client = _create_llm_client(args)
-	maps_api_key = args.baidu_ak or settings.baidu_map_ak
-	maps_client = DebugBaiduMapsClient(api_key=maps_api_key)
+async def _build_debug_map(service: TripMapService, itinerary: str) -> TripMapResponse:
+	# Geocodes start inside the task group as soon as each location is known, so they
+	# overlap with the remaining LLM generation. Each distinct name is geocoded once,
+	# with the city of the response that named it; names from a response without a
+	# city wait for the merged city. The service's geocode semaphore bounds how many of
+	# these hit Baidu at once.
+	tasks: dict[str, asyncio.Task[tuple[MapPoint | None, list[str]]]] = {}
+	deferred: list[str] = []
+
+	async with asyncio.TaskGroup() as task_group:
+
+		def start_geocode(location: str, day_city: str | None, point: MapPoint | None) -> None:
+			if point is not None or location in tasks:
+				return
+			if day_city is None:
+				deferred.append(location)
+				return
+			tasks[location] = task_group.create_task(
+				_geocode_with_logging(service, location, day_city)
+			)
+
+		locations, city, provided = await _extract_locations_with_logging(
+			service, itinerary, start_geocode
+		)
+		for location in deferred:
+			if location not in tasks and location not in provided:
+				tasks[location] = task_group.create_task(
+					_geocode_with_logging(service, location, city)
+				)
+
+	resolved = dict(provided)
+	for location, point in provided.items():
+		logger.info(f"\n=== Using LLM coordinates for: {location} ===")
+		logger.info(point.model_dump_json(indent=2))
+
+	# Logged in itinerary order once every lookup has finished.
+	for location in dict.fromkeys(locations):
+		task = tasks.get(location)
+		if task is None:
+			continue
+		geocoded, output = task.result()
+		logger.info("\n".join(output))
+		if geocoded is not None:
+			resolved.setdefault(location, geocoded)
+	points = [resolved[location] for location in locations if location in resolved]
+
+	# Coordinates come from already validated MapPoints, so segments skip re-validation;
+	# TripMapResponse below remains the validated boundary.
+	segments = [
+		MapSegment.model_construct(
+			startIndex=index,
+			endIndex=index + 1,
+			coordinates=[
+				MapCoordinate.model_construct(lat=start.lat, lng=start.lng),
+				MapCoordinate.model_construct(lat=end.lat, lng=end.lng),
+			],
+		)
+		for index, (start, end) in enumerate(zip(points, points[1:]))
+	]
+
+	response = TripMapResponse(tripId="debug-trip", city=city, points=points, segments=segments)
+	logger.info("\n=== Final TripMapResponse ===")
+	logger.info(response.model_dump_json(indent=2))
+	return response
 
-	service = TripMapService(
-		trip_repository=_NullTripRepository(),
-		maps_client=maps_client,
-		llm_client=llm_client,
-	)
 
-	print(f"Using LLM client: {llm_client.__class__.__name__}")
-	print(f"Baidu Maps enabled: {maps_client.enabled}")
+async def _close_clients(llm_client: Any) -> None:
+	closers = [close_http_client()]
+	if isinstance(llm_client, ModelScopeLLMClient):
+		closers.append(llm_client.aclose())
+	await asyncio.gather(*closers)
 
+
+async def debug_flow(itinerary: str, args: argparse.Namespace) -> TripMapResponse:
+	llm_client = _create_llm_client(args)
+	logger.info(f"Using LLM client: {llm_client.__class__.__name__}")
+
+	# Checked before any HTTP client or cache is opened, so a refused mock run exits clean.
 	if isinstance(llm_client, MockLLMClient) and not args.allow_mock:
-		print(
+		logger.info(
 			"Detected MockLLMClient. Set MODELSCOPE_API_KEY / OPENAI_API_KEY or use --api-key to call a real model."
 		)
-		print("Use --allow-mock to continue with mock responses.")
-		await maps_client.close()
+		logger.info("Use --allow-mock to continue with mock responses.")
 		sys.exit(3)
 
-	try:
-		locations, city = await _extract_locations_with_logging(service, itinerary)
-
-		points = []
-		for location in locations:
-			print(f"\n=== Geocoding location: {location} ===")
-			point = await service._geocode_location(name=location, city=city)
-			print("Map point result:")
-			if point is None:
-				print("  Geocoding failed; no point produced.")
-			else:
-				print(json.dumps(point.model_dump(), ensure_ascii=False, indent=2))
-				points.append(point)
-
-		segments: list[MapSegment] = []
-		if len(points) >= 2:
-			for idx in range(len(points) - 1):
-				start = points[idx]
-				end = points[idx + 1]
-				segment = MapSegment(
-					startIndex=idx,
-					endIndex=idx + 1,
-					coordinates=[
-						MapCoordinate(lat=start.lat, lng=start.lng),
-						MapCoordinate(lat=end.lat, lng=end.lng),
-					],
-				)
-				segments.append(segment)
+	async with AsyncExitStack() as stack:
+		maps_api_key = args.baidu_ak or get_settings().baidu_map_ak
+		geocode_cache = None if args.no_cache else _open_geocode_cache(GEOCODE_CACHE_PATH)
+		if geocode_cache is not None:
+			stack.callback(geocode_cache.close)
+		stack.push_async_callback(_close_clients, llm_client)
+		# Same pooled client the API uses, so every geocode reuses one keep-alive connection.
+		maps_client = DebugBaiduMapsClient(
+			api_key=maps_api_key,
+			client=get_http_client(),
+			cache=geocode_cache,
+			verbose=args.verbose,
+			qps=args.geocode_qps,
+		)
 
-		response = TripMapResponse(tripId="debug-trip", city=city, points=points, segments=segments)
-		print("\n=== Final TripMapResponse ===")
-		print(json.dumps(response.model_dump(), ensure_ascii=False, indent=2))
-		return response
-	finally:
-		await maps_client.close()
+		service = TripMapService(
+			trip_repository=_NullTripRepository(),
+			maps_client=maps_client,
+			llm_client=llm_client,
+		)
+
+		logger.info(f"Baidu Maps enabled: {maps_client.enabled}")
+
+		# Callbacks unwind in reverse: the network clients close together, then the geocode
+		# cache, whether or not the map was built.
+		response = await _build_debug_map(service, itinerary)
+	return response
 
 
 def _load_itinerary(args: argparse.Namespace) -> str:
@@ -235,8 +536,13 @@ def _load_itinerary(args: argparse.Namespace) -> str:
 		return args.itinerary
 
 	if args.itinerary_file:
-		path = Path(args.itinerary_file)
-		content = path.read_text(encoding="utf-8").strip()
+		# Decoded straight from a read-only mapping, so a large file is not first copied into
+		# an intermediate bytes buffer. Empty files cannot be mapped and are rejected first.
+		with Path(args.itinerary_file).open("rb") as file:
+			content = ""
+			if os.fstat(file.fileno()).st_size:
+				with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+					content = str(mapped, "utf-8").strip()
 		if not content:
 			raise ValueError("Itinerary file is empty")
 		return content
@@ -248,12 +554,12 @@ async def _async_main(args: argparse.Namespace) -> None:
 	try:
 		itinerary = _load_itinerary(args)
 	except Exception as exc:
-		print(f"Failed to load itinerary: {exc}")
+		logger.error(f"Failed to load itinerary: {exc}")
 		sys.exit(1)
 
-	print("=== Debugging Trip Map Flow ===")
-	print("Itinerary input:")
-	print(itinerary)
+	logger.info("=== Debugging Trip Map Flow ===")
+	logger.info("Itinerary input:")
+	logger.info(itinerary)
 
 	await debug_flow(itinerary, args)
 
@@ -295,10 +601,47 @@ def main(argv: list[str] | None = None) -> None:
 		type=str,
 		help="Override the Baidu Maps API key used for geocoding."
 	)
+	parser.add_argument(
+		"--verbose",
+		action="store_true",
+		help="Print raw Baidu geocode response bodies."
+	)
+	parser.add_argument(
+		"--geocode-qps",
+		type=float,
+		default=DEFAULT_GEOCODE_QPS,
+		help="Maximum Baidu geocode requests per second."
+	)
+	parser.add_argument(
+		"--no-cache",
+		action="store_true",
+		help=f"Skip the on-disk geocode cache at {GEOCODE_CACHE_PATH}."
+	)
 
 	args = parser.parse_args(argv)
-
-	asyncio.run(_async_main(args))
+	if args.geocode_qps <= 0:
+		parser.error("--geocode-qps must be positive")
+
+	# Output is written to stdout by a listener thread, so the event loop never blocks on
+	# terminal or pipe writes while lookups are in flight.
+	log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+	stream_handler = logging.StreamHandler(sys.stdout)
+	stream_handler.setFormatter(logging.Formatter("%(message)s"))
+	listener = logging.handlers.QueueListener(log_queue, stream_handler)
+	logger.addHandler(logging.handlers.QueueHandler(log_queue))
+	logger.setLevel(logging.INFO)
+	logger.propagate = False
+
+	# uvloop (pulled in by uvicorn[standard]) cuts per-request event loop overhead for the
+	# concurrent LLM and geocode calls; the stdlib loop is used when it is unavailable.
+	loop_factory = uvloop.new_event_loop if uvloop is not None else None
+
+	listener.start()
+	try:
+		with asyncio.Runner(loop_factory=loop_factory) as runner:
+			runner.run(_async_main(args))
+	finally:
+		listener.stop()
 
 
 if __name__ == "__main__":
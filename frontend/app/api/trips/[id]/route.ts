@@ -16,20 +16,38 @@ export async function GET(
     return NextResponse.json({ message: "tripId and userId are required" }, { status: 400 });
   }
 
+  const ifNoneMatch = _request.headers.get("if-none-match");
   const response = await fetch(
     `${BACKEND_URL}/api/v1/trips/${encodeURIComponent(tripId)}?userId=${encodeURIComponent(userId)}`,
     {
       headers: {
-        "content-type": "application/json"
+        "content-type": "application/json",
+        ...(ifNoneMatch ? { "if-none-match": ifNoneMatch } : {})
       },
       cache: "no-store"
     }
   );
 
+  // Pass revalidation through so the browser can reuse its cached copy.
+  if (response.status === 304) {
+    return new NextResponse(null, { status: 304, headers: cacheHeaders(response) });
+  }
+
   if (!response.ok) {
     return NextResponse.json({ message: "Failed to load trip" }, { status: response.status });
   }
 
   const payload = await response.json();
-  return NextResponse.json(payload);
+  return NextResponse.json(payload, { headers: cacheHeaders(response) });
+}
+
+function cacheHeaders(response: Response): HeadersInit {
+  const headers: Record<string, string> = {};
+  for (const name of ["etag", "cache-control"]) {
+    const value = response.headers.get(name);
+    if (value) {
+      headers[name] = value;
+    }
+  }
+  return headers;
 }
@@ -40,3 +40,62 @@ alter table expenses enable row level security;
 create policy "Users manage expenses of their trips"
     on expenses for all
     using (trip_id in (select id from trips where owner_id = auth.uid()));
+
+-- Expense writes from the backend use the service-role key, which bypasses RLS, so these
+-- functions check trip ownership in the same statement as the write.
+create or replace function add_trip_expense(
+    p_owner_id uuid,
+    p_trip_id uuid,
+    p_category text,
+    p_amount numeric,
+    p_currency char(3),
+    p_occurred_on date
+) returns setof expenses
+language sql
+as $$
+    insert into expenses (trip_id, category, amount, currency, occurred_on)
+    select t.id, p_category, p_amount, p_currency, p_occurred_on
+    from trips t
+    where t.id = p_trip_id and t.owner_id = p_owner_id
+    returning *;
+$$;
+
+create or replace function update_trip_expense(
+    p_owner_id uuid,
+    p_expense_id uuid,
+    p_updates jsonb
+) returns setof expenses
+language sql
+as $$
+    update expenses e set
+        category = case when p_updates ? 'category'
+            then p_updates ->> 'category' else e.category end,
+        amount = case when p_updates ? 'amount'
+            then (p_updates ->> 'amount')::numeric else e.amount end,
+        currency = case when p_updates ? 'currency'
+            then p_updates ->> 'currency' else e.currency end,
+        occurred_on = case when p_updates ? 'occurred_on'
+            then (p_updates ->> 'occurred_on')::date else e.occurred_on end
+    from trips t
+    where e.id = p_expense_id and t.id = e.trip_id and t.owner_id = p_owner_id
+    returning e.*;
+$$;
+
+create or replace function delete_trip_expense(
+    p_owner_id uuid,
+    p_expense_id uuid
+) returns setof expenses
+language sql
+as $$
+    delete from expenses e
+    using trips t
+    where e.id = p_expense_id and t.id = e.trip_id and t.owner_id = p_owner_id
+    returning e.*;
+$$;
+
+revoke execute on function add_trip_expense(uuid, uuid, text, numeric, char, date)
+    from public, anon, authenticated;
+revoke execute on function update_trip_expense(uuid, uuid, jsonb)
+    from public, anon, authenticated;
+revoke execute on function delete_trip_expense(uuid, uuid)
+    from public, anon, authenticated;